@@ -8,18 +8,30 @@ trajectory format, including GSO-specific scoring metrics (opt_base, opt_commit,
 
 import os
 import sys
-import json
+import time
 import argparse
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, Tuple
 from tqdm import tqdm
 from dotenv import load_dotenv
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+import docent.sdk.client
 from docent import Docent
 from docent.data_models import AgentRun, Transcript
 from docent.data_models.chat import (
     parse_chat_message,
+    ChatMessage,
     AssistantMessage,
+    SystemMessage,
     UserMessage,
     ToolMessage,
 )
@@ -27,6 +39,33 @@ from docent.data_models.chat.tool import ToolCall, ToolCallContent
 
 load_dotenv(Path(__file__).parent.parent / ".env")
 
+# add_agent_runs opens its own progress bars; with uploads running in
+# background threads they would draw over the "Ingesting trajectories" bar
+docent.sdk.client.tqdm = partial(tqdm, disable=True)
+
+# Read buffer for output.jsonl, whose lines are often many KB each
+TRAJ_READ_BUFFER = 16 * 1024 * 1024
+
+# Trajectory lines queued per parse worker; each line is a whole trajectory
+PARSE_IN_FLIGHT_PER_WORKER = 2
+
+# Concurrent batch uploads while parsing continues
+UPLOAD_WORKERS = 2
+
+# Threads for preloading per-instance GSO reports
+REPORT_LOAD_WORKERS = 32
+
+# Tool function names reported for OpenHands actions
+BASH_FUNCTION = "bash"
+READ_FUNCTION = "read_file"
+WRITE_FUNCTION = "write_file"
+
+# Run report instance sets, highest priority first when an id is in several
+STATUS_SETS = ("passed", "opt_base", "test_failed", "patch_failed", "error")
+
+# Events kept from each end of the history for runs with a skipped status
+SKIPPED_STATUS_EDGE_EVENTS = 5
+
 
 def find_trajectory_files(base_dir: Path) -> List[Path]:
     """Find all output.jsonl trajectory files under the base directory."""
@@ -34,7 +73,129 @@ def find_trajectory_files(base_dir: Path) -> List[Path]:
     return sorted(base_dir.glob("**/output.jsonl"))
 
 
-def convert_openhands_history_to_messages(history: List[dict]) -> List:
+def open_trajectory_file(traj_file: Path):
+    """Open a trajectory file for a single sequential read."""
+    f = open(traj_file, "rb", buffering=TRAJ_READ_BUFFER)
+    if hasattr(os, "posix_fadvise"):
+        # Ask the kernel for aggressive readahead (Linux/POSIX only)
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+    return f
+
+
+def _markdown_view(content: str) -> ToolCallContent:
+    """Build a markdown tool call view, skipping validation of our own strings."""
+    return ToolCallContent.model_construct(format="markdown", content=content)
+
+
+# Message for an agent action plus the (function, call_id) awaiting its observation
+ActionResult = Tuple[AssistantMessage, Optional[Tuple[str, str]]]
+
+
+def _handle_run(args: dict, thought: str, call_id: str, build_views: bool) -> ActionResult:
+    """Bash command."""
+    command = args.get("command", "")
+    message = AssistantMessage.model_construct(
+        content=thought,
+        tool_calls=[
+            ToolCall(
+                id=call_id,
+                function=BASH_FUNCTION,
+                arguments={"command": command},
+                view=_markdown_view(f"```bash\n{command}\n```") if build_views else None,
+            )
+        ],
+    )
+    return message, (BASH_FUNCTION, call_id)
+
+
+def _handle_read(args: dict, thought: str, call_id: str, build_views: bool) -> ActionResult:
+    """File read."""
+    path = args.get("path", "")
+    message = AssistantMessage.model_construct(
+        content=thought,
+        tool_calls=[
+            ToolCall(
+                id=call_id,
+                function=READ_FUNCTION,
+                arguments={"path": path},
+                view=_markdown_view(f"Reading file: `{path}`") if build_views else None,
+            )
+        ],
+    )
+    return message, (READ_FUNCTION, call_id)
+
+
+def _handle_write(args: dict, thought: str, call_id: str, build_views: bool) -> ActionResult:
+    """File write."""
+    path = args.get("path", "")
+    view = None
+    if build_views:
+        file_content = args.get("content", "")
+        if len(file_content) > 500:
+            file_content = file_content[:500] + "..."
+        view = _markdown_view(f"Writing to file: `{path}`\n```\n{file_content}\n```")
+    message = AssistantMessage.model_construct(
+        content=thought,
+        tool_calls=[
+            ToolCall(
+                id=call_id,
+                function=WRITE_FUNCTION,
+                arguments={"path": path},
+                view=view,
+            )
+        ],
+    )
+    return message, (WRITE_FUNCTION, call_id)
+
+
+def _handle_think(args: dict, thought: str, call_id: str, build_views: bool) -> ActionResult:
+    """Thinking/reasoning."""
+    return AssistantMessage.model_construct(content=f"**Thinking:** {thought}"), None
+
+
+def _handle_finish(args: dict, thought: str, call_id: str, build_views: bool) -> ActionResult:
+    """Finish action."""
+    return AssistantMessage.model_construct(content=f"**Finished:** {thought}"), None
+
+
+def _handle_other(
+    action: str, args: dict, thought: str, call_id: str, build_views: bool
+) -> ActionResult:
+    """Other actions - generic tool call."""
+    message = AssistantMessage.model_construct(
+        content=thought,
+        tool_calls=[
+            ToolCall(
+                id=call_id,
+                function=action,
+                arguments=args,
+                view=_markdown_view(f"Action: {action}") if build_views else None,
+            )
+        ],
+    )
+    return message, (action, call_id)
+
+
+# Agent action -> handler returning (message, pending tool call or None).
+# Actions not listed here fall back to _handle_other.
+_ACTION_HANDLERS = {
+    "run": _handle_run,
+    "read": _handle_read,
+    "write": _handle_write,
+    "think": _handle_think,
+    "finish": _handle_finish,
+}
+
+
+def convert_openhands_history_to_messages(
+    history: List[dict],
+    build_views: bool = True,
+    omitted_at: Optional[int] = None,
+    omitted_count: int = 0,
+) -> List[ChatMessage]:
     """
     Convert OpenHands event history to Docent message format.
     
@@ -42,160 +203,86 @@ def convert_openhands_history_to_messages(history: List[dict]) -> List:
     - Events have: source (agent/user/environment), action, observation, args, content
     - Actions: run, read, write, message, think, finish, etc.
     - Observations: run output, file contents, etc.
+    
+    With build_views=False, tool calls are emitted without their rendered
+    markdown view. If omitted_at is set, omitted_count events were dropped
+    just before history[omitted_at]; a note marks the gap and no tool call
+    from before it is paired with an observation after it.
     """
-    messages = []
-    pending_tool_call = None
+    messages: List[ChatMessage] = []
+    messages_append = messages.append
+    action_handlers_get = _ACTION_HANDLERS.get
+    pending_tool_call: Optional[Tuple[str, str]] = None
     call_counter = 1
     
-    for event in history:
-        source = event.get("source", "")
-        action = event.get("action")
-        observation = event.get("observation")
-        args = event.get("args", {})
-        content = event.get("content") or event.get("message", "")
+    for index, event in enumerate(history):
+        # Gap in a truncated history: results after it belong to dropped calls
+        if index == omitted_at:
+            messages_append(
+                SystemMessage.model_construct(content=f"... {omitted_count} events omitted ...")
+            )
+            pending_tool_call = None
+        
+        ev_get = event.get
+        action = ev_get("action")
         
         # Skip system events
         if action == "system":
             continue
+        
+        source = ev_get("source", "")
+        args = ev_get("args") or {}
+        args_get = args.get
             
         # User messages
         if source == "user" and action == "message":
-            msg_content = args.get("content", "") or content
+            msg_content = args_get("content", "") or ev_get("content") or ev_get("message", "")
             if msg_content:
-                messages.append(UserMessage(content=msg_content))
+                messages_append(UserMessage.model_construct(content=msg_content))
             continue
         
         # Agent actions (tool calls)
         if source == "agent" and action and action != "message":
-            thought = args.get("thought", "") or ""
+            thought = args_get("thought", "") or ""
+            call_id = f"call_{call_counter}"
             
-            if action == "run":
-                # Bash command
-                command = args.get("command", "")
-                call_id = f"call_{call_counter}"
-                call_counter += 1
-                messages.append(
-                    AssistantMessage(
-                        content=thought,
-                        tool_calls=[
-                            ToolCall(
-                                id=call_id,
-                                function="bash",
-                                arguments={"command": command},
-                                view=ToolCallContent(
-                                    format="markdown",
-                                    content=f"```bash\n{command}\n```"
-                                )
-                            )
-                        ],
-                    )
-                )
-                pending_tool_call = ("bash", call_id)
-                
-            elif action == "read":
-                # File read
-                path = args.get("path", "")
-                call_id = f"call_{call_counter}"
-                call_counter += 1
-                messages.append(
-                    AssistantMessage(
-                        content=thought,
-                        tool_calls=[
-                            ToolCall(
-                                id=call_id,
-                                function="read_file",
-                                arguments={"path": path},
-                                view=ToolCallContent(
-                                    format="markdown",
-                                    content=f"Reading file: `{path}`"
-                                )
-                            )
-                        ],
-                    )
-                )
-                pending_tool_call = ("read_file", call_id)
-                
-            elif action == "write":
-                # File write
-                path = args.get("path", "")
-                file_content = args.get("content", "")[:500] + "..." if len(args.get("content", "")) > 500 else args.get("content", "")
-                call_id = f"call_{call_counter}"
-                call_counter += 1
-                messages.append(
-                    AssistantMessage(
-                        content=thought,
-                        tool_calls=[
-                            ToolCall(
-                                id=call_id,
-                                function="write_file",
-                                arguments={"path": path},
-                                view=ToolCallContent(
-                                    format="markdown",
-                                    content=f"Writing to file: `{path}`\n```\n{file_content}\n```"
-                                )
-                            )
-                        ],
-                    )
-                )
-                pending_tool_call = ("write_file", call_id)
-                
-            elif action == "think":
-                # Thinking/reasoning
-                messages.append(AssistantMessage(content=f"**Thinking:** {thought}"))
-                pending_tool_call = None
-                
-            elif action == "finish":
-                # Finish action
-                final_thought = args.get("thought", "") or thought
-                messages.append(AssistantMessage(content=f"**Finished:** {final_thought}"))
-                pending_tool_call = None
-                
+            handler = action_handlers_get(action)
+            if handler:
+                message, pending_tool_call = handler(args, thought, call_id, build_views)
             else:
-                # Other actions - generic tool call
-                call_id = f"call_{call_counter}"
-                call_counter += 1
-                messages.append(
-                    AssistantMessage(
-                        content=thought,
-                        tool_calls=[
-                            ToolCall(
-                                id=call_id,
-                                function=action,
-                                arguments=args,
-                                view=ToolCallContent(
-                                    format="markdown",
-                                    content=f"Action: {action}"
-                                )
-                            )
-                        ],
-                    )
+                message, pending_tool_call = _handle_other(
+                    action, args, thought, call_id, build_views
                 )
-                pending_tool_call = (action, call_id)
+            messages_append(message)
+            
+            # Only tool calls consume a call id
+            if pending_tool_call:
+                call_counter += 1
             continue
         
         # Agent message (no action, just text)
         if source == "agent" and action == "message":
-            msg_content = args.get("content", "") or content
+            msg_content = args_get("content", "") or ev_get("content") or ev_get("message", "")
             if msg_content:
-                messages.append(AssistantMessage(content=msg_content))
+                messages_append(AssistantMessage.model_construct(content=msg_content))
             pending_tool_call = None
             continue
         
         # Observations (tool results)
-        if observation and pending_tool_call:
+        if pending_tool_call and ev_get("observation"):
             func_name, call_id = pending_tool_call
             
             # Get observation content
-            obs_content = event.get("content", "")
+            obs_content = ev_get("content", "")
             if not obs_content and "extras" in event:
-                obs_content = str(event.get("extras", {}))
+                obs_content = str(event["extras"])
             
             # Truncate very long outputs
             if len(obs_content) > 5000:
                 obs_content = obs_content[:5000] + "\n... (truncated)"
             
-            messages.append(
-                ToolMessage(
+            messages_append(
+                ToolMessage.model_construct(
                     content=obs_content,
                     tool_call_id=call_id,
                     function=func_name
@@ -214,20 +301,48 @@ def load_gso_report(logs_dir: Path, instance_id: str) -> dict:
         return {}
     
     try:
-        with open(report_path) as f:
-            report = json.load(f)
+        with open(report_path, "rb") as f:
+            report = json_loads(f.read())
             return report.get(instance_id, {})
     except Exception:
         return {}
 
 
+def load_gso_reports(logs_dir: Path) -> dict:
+    """Load the GSO evaluation reports of every instance under logs_dir."""
+    instance_ids = [p.parent.name for p in logs_dir.glob("*/report.json")]
+    with ThreadPoolExecutor(max_workers=REPORT_LOAD_WORKERS) as executor:
+        reports = executor.map(lambda iid: load_gso_report(logs_dir, iid), instance_ids)
+        return {iid: report for iid, report in zip(instance_ids, reports) if report}
+
+
+def build_status_map(run_report: Optional[dict]) -> dict:
+    """Map each instance id in a run-level report to its status."""
+    status_map = {}
+    if not run_report:
+        return status_map
+    
+    instance_sets = run_report.get("instance_sets", {})
+    for status in STATUS_SETS:
+        for instance_id in instance_sets.get(f"{status}_ids", []):
+            status_map.setdefault(instance_id, status)
+    return status_map
+
+
 def build_agent_run(
     traj_data: dict,
-    logs_dir: Optional[Path] = None,
+    gso_reports: Optional[dict] = None,
     model_name: Optional[str] = None,
-    run_report: Optional[dict] = None,
+    status_map: Optional[dict] = None,
+    build_views: bool = True,
+    skip_statuses: Optional[set] = None,
 ) -> Optional[AgentRun]:
-    """Build a Docent AgentRun from a GSO trajectory."""
+    """
+    Build a Docent AgentRun from a GSO trajectory.
+    
+    Runs whose status is in skip_statuses only convert the first and last
+    SKIPPED_STATUS_EDGE_EVENTS events of their history.
+    """
     
     instance_id = traj_data.get("instance_id")
     if not instance_id:
@@ -237,17 +352,35 @@ def build_agent_run(
     if not history:
         return None
     
+    # Decide status first so skipped runs avoid converting their full history
+    status = status_map.get(instance_id) if status_map else None
+    omitted_at = None
+    omitted_count = 0
+    if skip_statuses and status in skip_statuses:
+        if len(history) > 2 * SKIPPED_STATUS_EDGE_EVENTS:
+            omitted_at = SKIPPED_STATUS_EDGE_EVENTS
+            omitted_count = len(history) - 2 * SKIPPED_STATUS_EDGE_EVENTS
+            history = history[:SKIPPED_STATUS_EDGE_EVENTS] + history[-SKIPPED_STATUS_EDGE_EVENTS:]
+    
     # Convert OpenHands history to Docent messages
-    messages = convert_openhands_history_to_messages(history)
+    messages = convert_openhands_history_to_messages(
+        history,
+        build_views=build_views,
+        omitted_at=omitted_at,
+        omitted_count=omitted_count,
+    )
     if not messages:
         return None
     
-    transcript = Transcript(messages=messages)
+    # Messages come from our own converter, so skip re-validating them
+    transcript = Transcript.model_construct(messages=messages)
     
     # Build metadata
     metadata = {
         "instance_id": instance_id,
     }
+    if omitted_at is not None:
+        metadata["history_truncated"] = True
     
     # Add trajectory metadata
     traj_metadata = traj_data.get("metadata", {})
@@ -275,8 +408,8 @@ def build_agent_run(
     # Load GSO-specific scoring from evaluation report
     scores = {"status": "unknown"}
     
-    if logs_dir:
-        instance_report = load_gso_report(logs_dir, instance_id)
+    if gso_reports:
+        instance_report = gso_reports.get(instance_id)
         if instance_report:
             scores = {
                 "test_passed": instance_report.get("test_passed", False),
@@ -293,18 +426,8 @@ def build_agent_run(
                 scores["gm_speedup_patch_commit"] = opt_stats.get("gm_speedup_patch_commit")
     
     # Check run-level report for instance status
-    if run_report:
-        instance_sets = run_report.get("instance_sets", {})
-        if instance_id in instance_sets.get("passed_ids", []):
-            scores["status"] = "passed"
-        elif instance_id in instance_sets.get("opt_base_ids", []):
-            scores["status"] = "opt_base"
-        elif instance_id in instance_sets.get("test_failed_ids", []):
-            scores["status"] = "test_failed"
-        elif instance_id in instance_sets.get("patch_failed_ids", []):
-            scores["status"] = "patch_failed"
-        elif instance_id in instance_sets.get("error_ids", []):
-            scores["status"] = "error"
+    if status:
+        scores["status"] = status
     
     metadata["scores"] = scores
     
@@ -314,7 +437,124 @@ def build_agent_run(
     # Remove None values
     metadata = {k: v for k, v in metadata.items() if v is not None}
     
-    return AgentRun(transcripts=[transcript], metadata=metadata)
+    return AgentRun.model_construct(transcripts=[transcript], metadata=metadata)
+
+
+# Shared ingestion context for parse workers, set once per process
+_worker_context: dict = {}
+
+
+def _init_parse_worker(
+    gso_reports: dict,
+    model_name: Optional[str],
+    status_map: dict,
+    build_views: bool,
+    skip_statuses: Optional[set],
+) -> None:
+    """Store the shared build_agent_run arguments in a parse worker."""
+    _worker_context.update(
+        gso_reports=gso_reports,
+        model_name=model_name,
+        status_map=status_map,
+        build_views=build_views,
+        skip_statuses=skip_statuses,
+    )
+
+
+def _parse_one(line: bytes) -> Optional[AgentRun]:
+    """Parse one output.jsonl line into an AgentRun inside a parse worker."""
+    line = line.strip()
+    if not line:
+        return None
+    
+    try:
+        return build_agent_run(json_loads(line), **_worker_context)
+    except Exception as e:
+        print(f"Error parsing trajectory: {e}")
+        return None
+
+
+def _parse_in_order(
+    executor: ProcessPoolExecutor,
+    lines: Iterable[bytes],
+    max_in_flight: int,
+) -> Iterator[Optional[AgentRun]]:
+    """Parse lines in the pool one per task, yielding results in file order."""
+    pending: deque[Future] = deque()
+    for line in lines:
+        pending.append(executor.submit(_parse_one, line))
+        if len(pending) >= max_in_flight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+# Per-thread Docent client for upload threads, set by _init_upload_thread
+_upload_local = threading.local()
+
+
+def _init_upload_thread(api_key: str) -> None:
+    """Give an upload thread its own Docent client and HTTP session."""
+    _upload_local.client = Docent(api_key=api_key)
+
+
+def _upload_batch(
+    collection_id: str,
+    batch: List[AgentRun],
+    start: int,
+) -> Tuple[int, int]:
+    """
+    Upload one batch of AgentRuns, reporting failures instead of raising.
+    
+    Returns the number of runs uploaded (0 if the upload failed) and the
+    time spent uploading in nanoseconds.
+    """
+    upload_start = time.perf_counter_ns()
+    uploaded = 0
+    try:
+        _upload_local.client.add_agent_runs(collection_id, batch)
+        uploaded = len(batch)
+    except Exception as e:
+        print(f"Error uploading batch starting at index {start}: {e}")
+    finally:
+        # Free the runs as soon as they are sent; nothing reads them again
+        batch.clear()
+    return uploaded, time.perf_counter_ns() - upload_start
+
+
+def print_profile(
+    load_ns: int,
+    parse_ns: int,
+    upload_wait_ns: int,
+    upload_ns: int,
+    bytes_read: int,
+    num_runs: int,
+    num_uploaded: int,
+) -> None:
+    """Print per-phase ingestion timings and the phase that bounds them."""
+    total_ns = load_ns + parse_ns + upload_wait_ns
+    total_s = total_ns / 1e9
+    print("\nProfile:")
+    print(f"  Load reports:  {load_ns / 1e9:.2f}s")
+    print(f"  Parse:         {parse_ns / 1e9:.2f}s ({bytes_read / 1e6:.1f} MB read)")
+    print(
+        f"  Upload wait:   {upload_wait_ns / 1e9:.2f}s "
+        f"({upload_ns / 1e9:.2f}s uploading in background)"
+    )
+    runs = f"{num_uploaded}"
+    if num_uploaded != num_runs:
+        runs += f" of {num_runs} parsed"
+    print(f"  Runs uploaded: {runs} ({num_uploaded / total_s if total_s else 0:.1f} runs/sec)")
+    
+    # Parsing and uploading overlap, so whichever the pipeline waits on is the bottleneck
+    if num_uploaded < num_runs:
+        print(f"  -> {num_runs - num_uploaded} runs failed to upload; fix those errors first")
+    elif upload_wait_ns > parse_ns:
+        print("  -> network-bound on uploads; try a larger --batch-size")
+    elif load_ns > parse_ns:
+        print("  -> I/O-bound on loading per-instance reports from --logs-dir")
+    else:
+        print("  -> compute-bound on trajectory parsing; try --no-views or more --workers")
 
 
 def load_run_report(submission_dir: Path) -> Optional[dict]:
@@ -327,8 +567,8 @@ def load_run_report(submission_dir: Path) -> Optional[dict]:
     # Find report.json file (format: model_name.run_id.report.json)
     report_files = list(logs_dir.glob("*.report.json"))
     if report_files:
-        with open(report_files[0]) as f:
-            return json.load(f)
+        with open(report_files[0], "rb") as f:
+            return json_loads(f.read())
     
     return None
 
@@ -341,6 +581,10 @@ def ingest_trajectories(
     existing_collection_id: Optional[str] = None,
     model_name: Optional[str] = None,
     run_report: Optional[dict] = None,
+    workers: Optional[int] = None,
+    build_views: bool = True,
+    profile: bool = False,
+    skip_statuses: Optional[set] = None,
 ) -> str:
     """Create/update a Docent collection and upload AgentRuns in batches."""
     
@@ -363,44 +607,94 @@ def ingest_trajectories(
         client.make_collection_public(collection_id)
         print(f"Created public collection: {collection_name} ({collection_id})")
     
+    load_start = time.perf_counter_ns()
+    
     # Load run-level report if not provided
     if run_report is None:
         run_report = load_run_report(traj_file.parent)
-    
-    # Parse trajectories
-    agent_runs: List[AgentRun] = []
-    
-    with open(traj_file) as f:
-        lines = f.readlines()
-    
-    for line in tqdm(lines, desc="Parsing trajectories"):
-        line = line.strip()
-        if not line:
-            continue
+    status_map = build_status_map(run_report)
+    
+    # Load all per-instance reports up front rather than once per trajectory
+    gso_reports = load_gso_reports(logs_dir) if logs_dir else {}
+    
+    parse_start = time.perf_counter_ns()
+    
+    # Parse trajectories across worker processes, with only a few lines per
+    # worker read ahead so the file is never fully held in memory. Each full
+    # batch is uploaded in the background while parsing continues.
+    workers = workers or os.cpu_count() or 1
+    num_runs = 0
+    num_uploaded = 0
+    upload_ns = 0
+    upload_wait_ns = 0
+    buffer: List[AgentRun] = []
+    uploads: deque[Future] = deque()
+    
+    with (
+        open_trajectory_file(traj_file) as f,
+        ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_parse_worker,
+            initargs=(gso_reports, model_name, status_map, build_views, skip_statuses),
+        ) as executor,
+        ThreadPoolExecutor(
+            max_workers=UPLOAD_WORKERS,
+            initializer=_init_upload_thread,
+            initargs=(api_key,),
+        ) as uploader,
+        tqdm(desc="Ingesting trajectories") as pbar,
+    ):
+        for run in _parse_in_order(executor, f, workers * PARSE_IN_FLIGHT_PER_WORKER):
+            pbar.update()
+            if not run:
+                continue
+            
+            buffer.append(run)
+            if len(buffer) >= batch_size:
+                # Count before submitting; the upload clears the batch
+                batch_start = num_runs
+                num_runs += len(buffer)
+                uploads.append(
+                    uploader.submit(_upload_batch, collection_id, buffer, batch_start)
+                )
+                buffer = []
+                # Bound the number of parsed batches waiting on the network
+                if len(uploads) > UPLOAD_WORKERS:
+                    wait_start = time.perf_counter_ns()
+                    uploaded, elapsed_ns = uploads.popleft().result()
+                    num_uploaded += uploaded
+                    upload_ns += elapsed_ns
+                    upload_wait_ns += time.perf_counter_ns() - wait_start
+        bytes_read = f.tell()
         
-        try:
-            traj_data = json.loads(line)
-            run = build_agent_run(
-                traj_data,
-                logs_dir=logs_dir,
-                model_name=model_name,
-                run_report=run_report,
+        if buffer:
+            batch_start = num_runs
+            num_runs += len(buffer)
+            uploads.append(
+                uploader.submit(_upload_batch, collection_id, buffer, batch_start)
             )
-            if run:
-                agent_runs.append(run)
-        except Exception as e:
-            print(f"Error parsing trajectory: {e}")
-            continue
-    
-    print(f"Prepared {len(agent_runs)} runs")
-    
-    # Upload in batches
-    for i in tqdm(range(0, len(agent_runs), batch_size), desc="Uploading"):
-        try:
-            client.add_agent_runs(collection_id, agent_runs[i : i + batch_size])
-        except Exception as e:
-            print(f"Error uploading batch starting at index {i}: {e}")
-            continue
+        
+        # Wait for the uploads still in flight once parsing is done
+        drain_start = time.perf_counter_ns()
+        parse_ns = drain_start - parse_start - upload_wait_ns
+        for upload in uploads:
+            uploaded, elapsed_ns = upload.result()
+            num_uploaded += uploaded
+            upload_ns += elapsed_ns
+        upload_wait_ns += time.perf_counter_ns() - drain_start
+    
+    print(f"Uploaded {num_uploaded} of {num_runs} parsed runs")
+    
+    if profile:
+        print_profile(
+            load_ns=parse_start - load_start,
+            parse_ns=parse_ns,
+            upload_wait_ns=upload_wait_ns,
+            upload_ns=upload_ns,
+            bytes_read=bytes_read,
+            num_runs=num_runs,
+            num_uploaded=num_uploaded,
+        )
     
     return collection_id
 
@@ -412,6 +706,10 @@ def run_ingestion(
     collection_id: Optional[str] = None,
     logs_dir: Optional[Path] = None,
     report_file: Optional[Path] = None,
+    workers: Optional[int] = None,
+    build_views: bool = True,
+    profile: bool = False,
+    skip_statuses: Optional[set] = None,
 ) -> str:
     """
     Main ingestion entrypoint.
@@ -423,6 +721,11 @@ def run_ingestion(
         collection_id: Optional existing collection ID to add to
         logs_dir: Optional directory containing GSO evaluation logs
         report_file: Optional path to report.json file
+        workers: Number of parse processes (default: CPU count)
+        build_views: Whether to render markdown views for tool calls
+        profile: Whether to print per-phase timings after ingestion
+        skip_statuses: Run statuses whose trajectories keep only their first
+            and last events
     
     Returns:
         Collection ID
@@ -445,8 +748,8 @@ def run_ingestion(
     run_report = None
     if report_file and report_file.exists():
         try:
-            with open(report_file) as f:
-                run_report = json.load(f)
+            with open(report_file, "rb") as f:
+                run_report = json_loads(f.read())
         except Exception as e:
             print(f"Warning: Could not load report: {e}")
     
@@ -461,6 +764,10 @@ def run_ingestion(
         existing_collection_id=collection_id,
         model_name=model_name,
         run_report=run_report,
+        workers=workers,
+        build_views=build_views,
+        profile=profile,
+        skip_statuses=skip_statuses,
     )
 
 
@@ -505,9 +812,41 @@ def main():
         default=None,
         help="Path to report.json file (optional)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of processes for parsing trajectories (default: CPU count)",
+    )
+    parser.add_argument(
+        "--no-views",
+        action="store_true",
+        help="Skip rendering markdown views for tool calls",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print per-phase timings and the likely bottleneck after ingestion",
+    )
+    parser.add_argument(
+        "--skip-statuses",
+        type=str,
+        default=None,
+        help=(
+            "Comma-separated run statuses (e.g. error,patch_failed) whose "
+            f"trajectories keep only their first and last {SKIPPED_STATUS_EDGE_EVENTS} events"
+        ),
+    )
     
     args = parser.parse_args()
     
+    skip_statuses = None
+    if args.skip_statuses:
+        skip_statuses = {status.strip() for status in args.skip_statuses.split(",")}
+        unknown = skip_statuses.difference(STATUS_SETS)
+        if unknown:
+            parser.error(f"Unknown statuses for --skip-statuses: {', '.join(sorted(unknown))}")
+    
     collection_id = run_ingestion(
         submission_dir=args.submission_dir,
         collection_name=args.collection_name,
@@ -515,6 +854,10 @@ def main():
         collection_id=args.collection_id,
         logs_dir=args.logs_dir,
         report_file=args.report_file,
+        workers=args.workers,
+        build_views=not args.no_views,
+        profile=args.profile,
+        skip_statuses=skip_statuses,
     )
     
     if collection_id:
@@ -5,9 +5,22 @@ Reports are copied as-is; metadata tracked in manifest.json.
 """
 
 import json
-import shutil
 from pathlib import Path
 
+try:
+    import orjson
+
+    json_loads = orjson.loads
+
+    def json_dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj):
+        return json.dumps(obj, indent=2).encode()
+
 DOCENT_BASE = "https://docent.transluce.org/dashboard"
 GCS_BASE = "gs://gso-experiments"
 
@@ -35,13 +48,13 @@ def main():
             print(f"SKIP {model_name}: {src_path} not found")
             continue
 
-        # Copy report as-is
-        shutil.copy(src_path, dst_path)
+        # Copy report as-is, reusing the bytes read for the summary
+        data = src_path.read_bytes()
+        dst_path.write_bytes(data)
         print(f"OK {model_name}: {dst_path.name}")
 
         # Read summary for manifest
-        with open(src_path) as f:
-            report = json.load(f)
+        report = json_loads(data)
 
         summary = report.get("summary", {})
         manifest["models"][model_name] = {
@@ -59,8 +72,7 @@ def main():
 
     # Write manifest
     manifest_path = repo_dir / "results" / "manifest.json"
-    with open(manifest_path, "w") as f:
-        json.dump(manifest, f, indent=2)
+    manifest_path.write_bytes(json_dumps(manifest))
     print(f"\nWrote manifest: {manifest_path}")
 
 
@@ -0,0 +1,131 @@
+"""Schema checks for the AgentRuns built by docent_ingest.
+
+Messages, transcripts and runs are built with model_construct, which skips
+Pydantic validation. These tests re-validate the output so schema drift in
+docent shows up here instead of as a bad upload.
+"""
+
+import pytest
+from docent.data_models import AgentRun
+from docent.data_models.chat import AssistantMessage, ToolMessage
+
+from docent_ingest import build_agent_run
+
+
+def make_trajectory(instance_id: str = "repo__project-1") -> dict:
+    """A small OpenHands trajectory covering each converter branch."""
+    return {
+        "instance_id": instance_id,
+        "history": [
+            {"source": "agent", "action": "system", "args": {"content": "system prompt"}},
+            {"source": "user", "action": "message", "args": {"content": "Make it faster"}},
+            {"source": "agent", "action": "run", "args": {"command": "ls", "thought": "Look around"}},
+            {"source": "agent", "observation": "run", "content": "setup.py\nsrc"},
+            {"source": "agent", "action": "read", "args": {"path": "src/core.py"}},
+            {"source": "agent", "observation": "read", "content": "def slow(): ..."},
+            {"source": "agent", "action": "write", "args": {"path": "src/core.py", "content": "x" * 600}},
+            {"source": "agent", "observation": "write", "content": "", "extras": {"path": "src/core.py"}},
+            {"source": "agent", "action": "think", "args": {"thought": "Cache the result"}},
+            {"source": "agent", "action": "browse", "args": {"url": "https://example.com"}},
+            {"source": "agent", "observation": "browse", "content": "y" * 6000},
+            {"source": "agent", "action": "message", "args": {"content": "Done optimizing"}},
+            {"source": "agent", "action": "finish", "args": {"thought": "All tests pass"}},
+        ],
+        "metadata": {"agent_class": "CodeActAgent", "llm_config": {"model": "test-model"}},
+        "instance": {"repo": "repo/project", "api": "core.slow"},
+        "test_result": {"git_patch": "diff --git a/src/core.py b/src/core.py"},
+    }
+
+
+@pytest.mark.parametrize("build_views", [True, False])
+def test_agent_run_round_trips_through_validation(build_views):
+    run = build_agent_run(
+        make_trajectory(),
+        gso_reports={"repo__project-1": {"test_passed": True, "opt_base": True}},
+        model_name="test-model",
+        status_map={"repo__project-1": "opt_base"},
+        build_views=build_views,
+    )
+
+    dumped = run.model_dump()
+    validated = AgentRun.model_validate(dumped)
+
+    assert validated.model_dump() == dumped
+    assert validated.metadata["scores"]["status"] == "opt_base"
+
+
+def test_tool_messages_pair_with_their_tool_calls():
+    run = build_agent_run(make_trajectory())
+    messages = run.transcripts[0].messages
+
+    tool_calls = {
+        call.id: call.function
+        for message in messages
+        if isinstance(message, AssistantMessage) and message.tool_calls
+        for call in message.tool_calls
+    }
+    tool_messages = [message for message in messages if isinstance(message, ToolMessage)]
+
+    assert len(tool_calls) == 4
+    assert len(tool_messages) == 4
+    for message in tool_messages:
+        assert tool_calls[message.tool_call_id] == message.function
+
+
+def test_truncated_history_does_not_pair_across_the_gap():
+    history = [
+        {"source": "user", "action": "message", "args": {"content": "Make it faster"}},
+        {"source": "agent", "action": "run", "args": {"command": "ls"}},
+        {"source": "agent", "observation": "run", "content": "setup.py"},
+        {"source": "agent", "action": "think", "args": {"thought": "Read the code"}},
+        # Head ends with a read whose result is dropped
+        {"source": "agent", "action": "read", "args": {"path": "src/core.py"}},
+        {"source": "agent", "observation": "read", "content": "def slow(): ..."},
+    ]
+    history += [{"source": "agent", "action": "think", "args": {"thought": str(i)}} for i in range(10)]
+    history += [
+        {"source": "agent", "action": "run", "args": {"command": "pytest"}},
+        # Tail starts with the output of the dropped run above
+        {"source": "agent", "observation": "run", "content": "LATE-RUN-OUTPUT"},
+        {"source": "agent", "action": "run", "args": {"command": "git diff"}},
+        {"source": "agent", "observation": "run", "content": "diff --git"},
+        {"source": "agent", "action": "think", "args": {"thought": "Out of ideas"}},
+        {"source": "agent", "action": "finish", "args": {"thought": "Giving up"}},
+    ]
+
+    run = build_agent_run(
+        {"instance_id": "repo__project-1", "history": history},
+        status_map={"repo__project-1": "error"},
+        skip_statuses={"error"},
+    )
+    messages = run.transcripts[0].messages
+
+    assert run.metadata["history_truncated"] is True
+    assert AgentRun.model_validate(run.model_dump()).model_dump() == run.model_dump()
+
+    tool_calls = {
+        call.id: call.function
+        for message in messages
+        if isinstance(message, AssistantMessage) and message.tool_calls
+        for call in message.tool_calls
+    }
+    tool_messages = [message for message in messages if isinstance(message, ToolMessage)]
+    for message in tool_messages:
+        assert tool_calls[message.tool_call_id] == message.function
+    assert "LATE-RUN-OUTPUT" not in [message.content for message in tool_messages]
+    assert "diff --git" in [message.content for message in tool_messages]
+    assert any("events omitted" in message.text for message in messages)
+
+
+def test_unknown_actions_are_generic_tool_calls():
+    history = [
+        {"source": "agent", "action": "omitted_events", "args": {"thought": "Custom action"}},
+        {"source": "agent", "observation": "omitted_events", "content": "ok"},
+    ]
+
+    run = build_agent_run({"instance_id": "repo__project-1", "history": history})
+    call_message, tool_message = run.transcripts[0].messages
+
+    assert call_message.tool_calls[0].function == "omitted_events"
+    assert tool_message.tool_call_id == call_message.tool_calls[0].id
+    assert "history_truncated" not in run.metadata